@@ -13,6 +13,8 @@ Supports LangFuse integration for:
 
 import json
 import logging
+import threading
+import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING, Literal
@@ -27,6 +29,66 @@ logger = logging.getLogger(__name__)
 
 PROMPTS_DIR = Path(__file__).parent / "prompts"
 
+# Circuit breaker for provider routing. When a provider fails this many
+# times in a row, route around it for the cooldown window instead of
+# paying its full retry latency on every call. State is per-container
+# (Cloud Run instances are single-process) and guarded by a lock because
+# instances serve concurrent requests.
+_CIRCUIT_FAILURE_THRESHOLD = 3
+_CIRCUIT_COOLDOWN_SECONDS = 60.0
+
+_circuit_lock = threading.Lock()
+_circuit_state: dict[str, dict[str, float]] = {}
+
+
+def _record_provider_result(provider: str, success: bool) -> None:
+    """Record an extraction outcome for circuit breaker bookkeeping.
+
+    Args:
+        provider: Provider name (gemini or openrouter)
+        success: Whether the extraction attempt succeeded
+    """
+    with _circuit_lock:
+        state = _circuit_state.setdefault(provider, {"failures": 0, "opened_at": 0.0})
+        if success:
+            state["failures"] = 0
+            state["opened_at"] = 0.0
+        else:
+            state["failures"] += 1
+            if state["failures"] >= _CIRCUIT_FAILURE_THRESHOLD:
+                state["opened_at"] = time.monotonic()
+
+
+def _is_circuit_open(provider: str) -> bool:
+    """Check whether a provider's circuit is currently open.
+
+    After the cooldown expires the circuit half-opens: the next call
+    probes the provider again and either closes or re-opens it.
+
+    Args:
+        provider: Provider name (gemini or openrouter)
+
+    Returns:
+        True if the provider should be skipped as primary
+    """
+    with _circuit_lock:
+        state = _circuit_state.get(provider)
+        if not state or not state["opened_at"]:
+            return False
+
+        if time.monotonic() - state["opened_at"] >= _CIRCUIT_COOLDOWN_SECONDS:
+            state["failures"] = 0
+            state["opened_at"] = 0.0
+            return False
+
+        return True
+
+
+def reset_circuit_state() -> None:
+    """Reset all provider circuit state (intended for tests)."""
+    with _circuit_lock:
+        _circuit_state.clear()
+
 
 @dataclass
 class InvoiceExtractionResult:
@@ -65,7 +127,10 @@ def extract_invoice(
     """Extract structured data from invoice images.
 
     Uses vendor-specific prompt for better accuracy. Attempts primary
-    LLM first, falls back to secondary on failure.
+    LLM first, falls back to secondary on failure. When the primary's
+    circuit is open (repeated consecutive failures), providers are tried
+    in reverse order so a degraded Gemini doesn't add its full retry
+    latency to every call.
 
     Supports LangFuse Prompt Management - fetches prompts from LangFuse
     with automatic fallback to local files if unavailable.
@@ -84,44 +149,56 @@ def extract_invoice(
     prompt_result = load_prompt_with_langfuse(vendor_type, observer)
     prompt = prompt_result.content
 
-    result = _try_extraction(images_data, prompt, llm_adapter, "gemini")
-    if result.success:
-        # Add prompt info to result
-        result.prompt_name = prompt_result.name
-        result.prompt_version = prompt_result.version
-        return result
-
-    logger.warning(
-        "Primary extraction failed, attempting fallback",
-        extra={
-            "vendor_type": vendor_type.value,
-            "primary_error": result.error,
-        },
-    )
-
+    providers: list[tuple[LLMAdapter, Literal["gemini", "openrouter"]]] = [
+        (llm_adapter, "gemini"),
+    ]
     if fallback_adapter:
-        fallback_result = _try_extraction(
-            images_data, prompt, fallback_adapter, "openrouter"
-        )
-        if fallback_result.success:
+        providers.append((fallback_adapter, "openrouter"))
+
+        if _is_circuit_open("gemini"):
+            providers.reverse()
+            logger.info(
+                "Primary circuit open - routing to fallback provider first",
+                extra={"vendor_type": vendor_type.value},
+            )
+
+    attempts: list[InvoiceExtractionResult] = []
+    for adapter, provider in providers:
+        result = _try_extraction(images_data, prompt, adapter, provider)
+        _record_provider_result(provider, result.success)
+
+        if result.success:
             # Add prompt info to result
-            fallback_result.prompt_name = prompt_result.name
-            fallback_result.prompt_version = prompt_result.version
-            return fallback_result
+            result.prompt_name = prompt_result.name
+            result.prompt_version = prompt_result.version
+            return result
+
+        attempts.append(result)
+        if len(attempts) < len(providers):
+            logger.warning(
+                "Primary extraction failed, attempting fallback",
+                extra={
+                    "vendor_type": vendor_type.value,
+                    "primary_error": result.error,
+                },
+            )
 
+    if len(attempts) == 2:
+        primary_result, fallback_result = attempts
         return InvoiceExtractionResult(
             success=False,
             invoice=None,
-            provider="openrouter",
-            latency_ms=result.latency_ms + fallback_result.latency_ms,
+            provider=fallback_result.provider,
+            latency_ms=primary_result.latency_ms + fallback_result.latency_ms,
             confidence=0.0,
-            error=f"Both providers failed. Primary: {result.error}. Fallback: {fallback_result.error}",
+            error=f"Both providers failed. Primary: {primary_result.error}. Fallback: {fallback_result.error}",
             raw_response=fallback_result.raw_response,
             prompt_name=prompt_result.name,
             prompt_version=prompt_result.version,
         )
 
     # Add prompt info to failed result
+    result = attempts[0]
     result.prompt_name = prompt_result.name
     result.prompt_version = prompt_result.version
     return result
@@ -5,22 +5,44 @@ Validates image quality, detects vendor type, archives originals,
 and publishes classification results to invoice-classified topic.
 """
 
-import base64
-import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
 
 import functions_framework
 from cloudevents.http import CloudEvent
 
 from shared.adapters import GCSAdapter, PubSubAdapter
 from shared.schemas.messages import InvoiceClassifiedMessage, InvoiceConvertedMessage
-from shared.utils import configure_logging, function_timer, get_config, parse_gcs_uri
+from shared.utils import configure_logging, get_config, parse_gcs_uri, run_handler
+from shared.utils.timing import FunctionTimer
 
 from .classifier import classify_vendor, validate_all_images
 
 configure_logging()
 logger = logging.getLogger(__name__)
 
+_clients: dict[str, Any] = {}
+
+
+def _get_clients() -> dict[str, Any]:
+    """Build and cache service clients for reuse across warm invocations.
+
+    Cloud Run keeps module globals alive between requests, so constructing
+    the GCS and Pub/Sub clients once per container (instead of once per
+    event) amortizes channel setup and auth token fetches. Config is
+    already cached via get_config(); this extends the same pattern.
+
+    Returns:
+        Dict with storage and messaging clients
+    """
+    if not _clients:
+        config = get_config()
+        _clients["storage"] = GCSAdapter(project_id=config.project_id)
+        _clients["messaging"] = PubSubAdapter(project_id=config.project_id)
+
+    return _clients
+
 
 @functions_framework.cloud_event
 def handle_invoice_converted(cloud_event: CloudEvent) -> None:
@@ -42,130 +64,125 @@ def handle_invoice_converted(cloud_event: CloudEvent) -> None:
     Raises:
         Exception: Re-raised to trigger Cloud Run retry on failure
     """
+    run_handler(
+        cloud_event,
+        InvoiceConvertedMessage,
+        _process_converted_invoice,
+        logger,
+        "Classification",
+    )
+
+
+def _process_converted_invoice(
+    message: InvoiceConvertedMessage, timing: FunctionTimer
+) -> dict[str, Any]:
+    """Classify and archive a validated converted-invoice message.
+
+    Args:
+        message: Validated InvoiceConvertedMessage
+        timing: Mutable timing dict shared with run_handler logs
+
+    Returns:
+        Extra fields for the completion log
+    """
     config = get_config()
-    storage = GCSAdapter(project_id=config.project_id)
-    messaging = PubSubAdapter(project_id=config.project_id)
-
-    source_file = "unknown"
-    total_input_bytes = 0
-    exception_to_raise: Exception | None = None
-    classification = None
-    avg_score = 0.0
-
-    with function_timer() as timing:
-        try:
-            message_data = base64.b64decode(cloud_event.data["message"]["data"])
-            raw_message = json.loads(message_data)
-
-            message = InvoiceConvertedMessage.model_validate(raw_message)
-            source_file = message.source_file
-
-            logger.info(
-                "Processing converted invoice",
-                extra={
-                    "source_file": source_file,
-                    "page_count": message.page_count,
-                    "converted_files": message.converted_files,
-                },
-            )
-
-            images_data = []
-            total_input_bytes = 0
-            for png_uri in message.converted_files:
-                bucket, path = parse_gcs_uri(png_uri)
-                png_data = storage.read(bucket, path)
-                images_data.append(png_data)
-                total_input_bytes += len(png_data)
-
-            logger.info(
-                "Downloaded all images",
-                extra={
-                    "source_file": source_file,
-                    "file_count": len(images_data),
-                    "total_input_bytes": total_input_bytes,
-                },
-            )
-
-            all_valid, avg_score, issues = validate_all_images(images_data)
-
-            if not all_valid:
-                logger.warning(
-                    "Image quality validation failed",
-                    extra={
-                        "source_file": source_file,
-                        "quality_score": avg_score,
-                        "issues": issues,
-                    },
-                )
-
-            classification = classify_vendor(source_file, message.converted_files)
-
-            logger.info(
-                "Vendor classification complete",
-                extra={
-                    "source_file": source_file,
-                    "vendor_type": classification.vendor_type.value,
-                    "confidence": classification.confidence,
-                    "detection_method": classification.detection_method,
-                    "matched_pattern": classification.matched_pattern,
-                },
-            )
-
-            source_bucket, source_path = parse_gcs_uri(source_file)
-            archive_path = source_path
-            archive_uri = storage.copy(
-                source_bucket,
-                source_path,
-                config.archive_bucket,
-                archive_path,
-            )
-
-            logger.info(
-                "Archived original file",
-                extra={
-                    "source_file": source_file,
-                    "archive_uri": archive_uri,
-                },
-            )
-
-            classified_message = InvoiceClassifiedMessage(
-                source_file=source_file,
-                converted_files=message.converted_files,
-                vendor_type=classification.vendor_type,
-                quality_score=avg_score,
-                archived_to=archive_uri,
-            )
-
-            messaging.publish(
-                config.classified_topic,
-                classified_message.model_dump(mode="json"),
-            )
-
-        except Exception as e:
-            exception_to_raise = e
-
-    if exception_to_raise:
-        logger.exception(
-            "Classification failed",
+    clients = _get_clients()
+    storage = clients["storage"]
+    messaging = clients["messaging"]
+
+    source_file = message.source_file
+
+    # Shared by every log call in this invocation - merge with
+    # {**base_extra, ...} instead of rebuilding the dict each time.
+    base_extra = {"source_file": source_file}
+
+    logger.info(
+        "Processing converted invoice",
+        extra={
+            **base_extra,
+            "page_count": message.page_count,
+            "converted_files": message.converted_files,
+        },
+    )
+
+    # Downloads are network-bound, so fetch all pages concurrently.
+    # executor.map preserves input order (page order matters downstream).
+    parsed_uris = [parse_gcs_uri(png_uri) for png_uri in message.converted_files]
+    max_workers = min(8, max(1, len(parsed_uris)))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        images_data = list(
+            executor.map(lambda pair: storage.read(*pair), parsed_uris)
+        )
+
+    total_input_bytes = sum(map(len, images_data))
+    timing["total_input_bytes"] = total_input_bytes
+
+    logger.info(
+        "Downloaded all images",
+        extra={
+            **base_extra,
+            "file_count": len(images_data),
+            "total_input_bytes": total_input_bytes,
+        },
+    )
+
+    all_valid, avg_score, issues = validate_all_images(images_data)
+
+    if not all_valid:
+        logger.warning(
+            "Image quality validation failed",
             extra={
-                "error": str(exception_to_raise),
-                "error_type": type(exception_to_raise).__name__,
-                "source_file": source_file,
-                "latency_ms": timing["latency_ms"],
-                "total_input_bytes": total_input_bytes,
+                **base_extra,
+                "quality_score": avg_score,
+                "issues": issues,
             },
-            exc_info=exception_to_raise,
         )
-        raise exception_to_raise
+
+    classification = classify_vendor(source_file, message.converted_files)
 
     logger.info(
-        "Classification complete - published event",
+        "Vendor classification complete",
         extra={
-            "source_file": source_file,
-            "vendor_type": classification.vendor_type.value if classification else "unknown",
-            "quality_score": avg_score,
-            "topic": config.classified_topic,
-            "latency_ms": timing["latency_ms"],
-            "total_input_bytes": total_input_bytes,
+            **base_extra,
+            "vendor_type": classification.vendor_type.value,
+            "confidence": classification.confidence,
+            "detection_method": classification.detection_method,
+            "matched_pattern": classification.matched_pattern,
         },
     )
+
+    source_bucket, source_path = parse_gcs_uri(source_file)
+    archive_path = source_path
+    archive_uri = storage.copy(
+        source_bucket,
+        source_path,
+        config.archive_bucket,
+        archive_path,
+    )
+
+    logger.info(
+        "Archived original file",
+        extra={**base_extra, "archive_uri": archive_uri},
+    )
+
+    # Every field below comes from already-validated internal values
+    # (the inbound message and the classification result), so skip
+    # the second full validation pass with model_construct.
+    classified_message = InvoiceClassifiedMessage.model_construct(
+        source_file=source_file,
+        converted_files=message.converted_files,
+        vendor_type=classification.vendor_type,
+        quality_score=avg_score,
+        archived_to=archive_uri,
+    )
+
+    messaging.publish_bytes(
+        config.classified_topic,
+        classified_message.model_dump_json().encode("utf-8"),
+    )
+
+    return {
+        "vendor_type": classification.vendor_type.value,
+        "quality_score": avg_score,
+        "topic": config.classified_topic,
+    }
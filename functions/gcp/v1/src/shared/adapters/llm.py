@@ -221,8 +221,32 @@ class OpenRouterAdapter:
         self._model = model
         self._max_retries = max_retries
         self._timeout = timeout
+        self._client = None
         self._observer = observer
 
+    def _get_client(self):
+        """Lazy-load OpenAI client with a persistent connection pool.
+
+        The adapter is cached at module scope by its callers, so keeping
+        one client here means the TLS handshake and connection setup are
+        paid once per container instead of once per extract() call.
+        """
+        if self._client is None:
+            import httpx
+            from openai import OpenAI
+
+            self._client = OpenAI(
+                base_url="https://openrouter.ai/api/v1",
+                api_key=self._api_key,
+                http_client=httpx.Client(
+                    limits=httpx.Limits(
+                        max_keepalive_connections=20,
+                        keepalive_expiry=600,
+                    ),
+                ),
+            )
+        return self._client
+
     def extract(self, prompt: str, image_data: list[bytes]) -> LLMResponse:
         """Extract structured data using OpenRouter (Claude).
 
@@ -233,14 +257,12 @@ class OpenRouterAdapter:
         Returns:
             LLMResponse with extraction result
         """
-        from openai import OpenAI
-
         start_time = time.time()
         retry_count = 0
         last_error = None
         generation_ctx = None
 
-        client = OpenAI(base_url="https://openrouter.ai/api/v1", api_key=self._api_key)
+        client = self._get_client()
 
         if self._observer:
             generation_ctx = self._observer.start_generation(
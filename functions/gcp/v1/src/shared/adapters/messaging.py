@@ -23,6 +23,19 @@ class MessagingAdapter(Protocol):
         """
         ...
 
+    def publish_bytes(self, topic: str, data: bytes, attributes: dict[str, str] | None = None) -> str:
+        """Publish pre-serialized payload to topic.
+
+        Args:
+            topic: Topic name (without projects/.../topics/ prefix)
+            data: Message payload as JSON-encoded bytes
+            attributes: Optional message attributes
+
+        Returns:
+            Message ID
+        """
+        ...
+
 
 class PubSubAdapter:
     """Google Cloud Pub/Sub implementation."""
@@ -30,12 +43,23 @@ class PubSubAdapter:
     def __init__(self, project_id: str | None = None):
         """Initialize Pub/Sub publisher.
 
+        Each Cloud Run invocation publishes exactly one message, so the
+        default batching (up to 1s delay waiting for more messages) only
+        adds latency. Flush each message immediately instead; publish()
+        already blocks on future.result() so nothing is left in-flight
+        when the handler returns.
+
         Args:
             project_id: GCP project ID (uses ADC default if None)
         """
         from google.cloud import pubsub_v1
 
-        self._publisher = pubsub_v1.PublisherClient()
+        batch_settings = pubsub_v1.types.BatchSettings(
+            max_messages=1,
+            max_bytes=1024 * 1024,
+            max_latency=0.01,
+        )
+        self._publisher = pubsub_v1.PublisherClient(batch_settings=batch_settings)
         self._project_id = project_id or self._get_default_project()
 
     def _get_default_project(self) -> str:
@@ -71,9 +95,26 @@ class PubSubAdapter:
         Returns:
             Message ID
         """
-        topic_path = self._publisher.topic_path(self._project_id, topic)
-
         data = json.dumps(message, default=str).encode("utf-8")
+        return self.publish_bytes(topic, data, attributes)
+
+    def publish_bytes(
+        self, topic: str, data: bytes, attributes: dict[str, str] | None = None
+    ) -> str:
+        """Publish pre-serialized payload to Pub/Sub topic.
+
+        Skips the dict round-trip for callers that already have JSON bytes
+        (e.g. Pydantic's model_dump_json output).
+
+        Args:
+            topic: Topic name (e.g., "invoice-converted")
+            data: Message payload as JSON-encoded bytes
+            attributes: Optional message attributes
+
+        Returns:
+            Message ID
+        """
+        topic_path = self._publisher.topic_path(self._project_id, topic)
 
         if attributes:
             future = self._publisher.publish(topic_path, data, **attributes)
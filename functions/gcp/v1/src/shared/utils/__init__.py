@@ -6,10 +6,12 @@ Exports:
 - configure_logging: Structured JSON logging setup
 - parse_gcs_uri: Parse GCS URIs into bucket and path
 - function_timer: Context manager for timing function execution
+- run_handler: Shared scaffolding for Pub/Sub CloudEvent handlers
 """
 
 from shared.utils.config import Config, get_config
 from shared.utils.gcs import parse_gcs_uri
+from shared.utils.handler import run_handler
 from shared.utils.logging import configure_logging
 from shared.utils.timing import function_timer
 
@@ -19,4 +21,5 @@ __all__ = [
     "configure_logging",
     "parse_gcs_uri",
     "function_timer",
+    "run_handler",
 ]
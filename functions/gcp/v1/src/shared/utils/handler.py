@@ -0,0 +1,84 @@
+"""Shared scaffolding for Pub/Sub-triggered CloudEvent handlers.
+
+Every Pub/Sub entry point repeats the same steps: base64-decode the
+message, validate it with Pydantic, time the body, log failures with
+latency, and re-raise so Cloud Run retries. Centralizing that here keeps
+each function's main.py down to its pipeline logic and its module small
+for cold-start imports.
+"""
+
+import base64
+import logging
+from typing import Any, Callable, TypeVar
+
+from cloudevents.http import CloudEvent
+from pydantic import BaseModel
+
+from shared.utils.timing import FunctionTimer, function_timer
+
+MessageT = TypeVar("MessageT", bound=BaseModel)
+
+
+def run_handler(
+    cloud_event: CloudEvent,
+    message_cls: type[MessageT],
+    body_fn: Callable[[MessageT, FunctionTimer], dict[str, Any] | None],
+    logger: logging.Logger,
+    name: str,
+    on_error: Callable[[], None] | None = None,
+) -> None:
+    """Decode, validate, time, and log a Pub/Sub CloudEvent handler.
+
+    The body may stash extra metrics in the timing dict (e.g.
+    total_input_bytes); they are merged into the completion and failure
+    logs alongside latency_ms. Returning a dict of extra log fields emits
+    a "<name> complete - published event" info log; returning None skips
+    it (e.g. when the invoice was routed to the failed bucket instead).
+
+    Args:
+        cloud_event: CloudEvent containing the base64-encoded Pub/Sub message
+        message_cls: Pydantic model to validate the message payload against
+        body_fn: Handler body taking (message, timing dict)
+        logger: Logger of the calling function module
+        name: Stage name used in log messages (e.g. "Classification")
+        on_error: Optional callback invoked when the body raises
+            (e.g. submitting an observer flush)
+
+    Raises:
+        Exception: Re-raised from the body to trigger Cloud Run retry
+    """
+    source_file = "unknown"
+    exception_to_raise: Exception | None = None
+    success_extra: dict[str, Any] | None = None
+
+    with function_timer() as timing:
+        try:
+            message_data = base64.b64decode(cloud_event.data["message"]["data"])
+            message = message_cls.model_validate_json(message_data)
+            source_file = getattr(message, "source_file", "unknown")
+
+            success_extra = body_fn(message, timing)
+
+        except Exception as e:
+            exception_to_raise = e
+            if on_error:
+                on_error()
+
+    if exception_to_raise:
+        logger.exception(
+            f"{name} failed",
+            extra={
+                "error": str(exception_to_raise),
+                "error_type": type(exception_to_raise).__name__,
+                "source_file": source_file,
+                **timing,
+            },
+            exc_info=exception_to_raise,
+        )
+        raise exception_to_raise
+
+    if success_extra is not None:
+        logger.info(
+            f"{name} complete - published event",
+            extra={"source_file": source_file, **success_extra, **timing},
+        )
@@ -0,0 +1,155 @@
+"""Unit tests for the shared CloudEvent handler scaffolding."""
+
+import base64
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from shared.schemas.messages import InvoiceConvertedMessage
+from shared.utils.handler import run_handler
+
+logger = logging.getLogger("test_handler")
+
+
+def _make_cloud_event(payload: bytes) -> SimpleNamespace:
+    """Build a minimal CloudEvent-shaped object with a Pub/Sub payload."""
+    return SimpleNamespace(
+        data={"message": {"data": base64.b64encode(payload).decode()}}
+    )
+
+
+def _sample_message_bytes() -> bytes:
+    message = InvoiceConvertedMessage(
+        source_file="gs://input/test.tiff",
+        converted_files=["gs://processed/test_page1.png"],
+        page_count=1,
+    )
+    return message.model_dump_json().encode("utf-8")
+
+
+class TestRunHandler:
+    """Tests for run_handler."""
+
+    def test_body_receives_validated_message(self):
+        """Body should be called with the validated Pydantic message."""
+        received = {}
+
+        def body(message, timing):
+            received["message"] = message
+            return {}
+
+        run_handler(
+            _make_cloud_event(_sample_message_bytes()),
+            InvoiceConvertedMessage,
+            body,
+            logger,
+            "Test",
+        )
+
+        assert isinstance(received["message"], InvoiceConvertedMessage)
+        assert received["message"].source_file == "gs://input/test.tiff"
+
+    def test_completion_log_includes_body_fields_and_latency(self, caplog):
+        """Returning extras emits a completion log with latency merged in."""
+        with caplog.at_level(logging.INFO, logger="test_handler"):
+            run_handler(
+                _make_cloud_event(_sample_message_bytes()),
+                InvoiceConvertedMessage,
+                lambda message, timing: {"topic": "invoice-classified"},
+                logger,
+                "Test",
+            )
+
+        record = caplog.records[-1]
+        assert "Test complete - published event" in record.message
+        assert record.topic == "invoice-classified"
+        assert record.latency_ms >= 0
+
+    def test_returning_none_skips_completion_log(self, caplog):
+        """Bodies that route to the failed bucket skip the completion log."""
+        with caplog.at_level(logging.INFO, logger="test_handler"):
+            run_handler(
+                _make_cloud_event(_sample_message_bytes()),
+                InvoiceConvertedMessage,
+                lambda message, timing: None,
+                logger,
+                "Test",
+            )
+
+        assert not caplog.records
+
+    def test_body_exception_is_logged_and_reraised(self, caplog):
+        """Exceptions from the body are logged with latency and re-raised."""
+
+        def body(message, timing):
+            raise ValueError("boom")
+
+        with caplog.at_level(logging.ERROR, logger="test_handler"):
+            with pytest.raises(ValueError, match="boom"):
+                run_handler(
+                    _make_cloud_event(_sample_message_bytes()),
+                    InvoiceConvertedMessage,
+                    body,
+                    logger,
+                    "Test",
+                )
+
+        record = caplog.records[-1]
+        assert "Test failed" in record.message
+        assert record.error_type == "ValueError"
+        assert record.source_file == "gs://input/test.tiff"
+        assert record.latency_ms >= 0
+
+    def test_invalid_message_is_logged_and_reraised(self, caplog):
+        """Validation failures surface before the body runs."""
+        with caplog.at_level(logging.ERROR, logger="test_handler"):
+            with pytest.raises(Exception):
+                run_handler(
+                    _make_cloud_event(b'{"source_file": "gs://input/test.tiff"}'),
+                    InvoiceConvertedMessage,
+                    lambda message, timing: {},
+                    logger,
+                    "Test",
+                )
+
+        record = caplog.records[-1]
+        assert record.source_file == "unknown"
+
+    def test_on_error_callback_runs_on_failure(self):
+        """The on_error hook fires when the body raises."""
+        calls = []
+
+        def body(message, timing):
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            run_handler(
+                _make_cloud_event(_sample_message_bytes()),
+                InvoiceConvertedMessage,
+                body,
+                logger,
+                "Test",
+                on_error=lambda: calls.append(True),
+            )
+
+        assert calls == [True]
+
+    def test_custom_timing_metrics_appear_in_failure_log(self, caplog):
+        """Metrics stashed in the timing dict are merged into the failure log."""
+
+        def body(message, timing):
+            timing["total_input_bytes"] = 1234
+            raise RuntimeError("boom")
+
+        with caplog.at_level(logging.ERROR, logger="test_handler"):
+            with pytest.raises(RuntimeError):
+                run_handler(
+                    _make_cloud_event(_sample_message_bytes()),
+                    InvoiceConvertedMessage,
+                    body,
+                    logger,
+                    "Test",
+                )
+
+        assert caplog.records[-1].total_input_bytes == 1234
@@ -10,16 +10,27 @@ import pytest
 
 from functions.data_extractor.extractor import (
     InvoiceExtractionResult,
+    _is_circuit_open,
     _parse_and_validate,
+    _record_provider_result,
     extract_invoice,
     get_available_prompts,
     load_prompt_template,
+    reset_circuit_state,
 )
 from shared.adapters.llm import LLMResponse
 from shared.schemas.invoice import VendorType
 from tests.fixtures.sample_invoices import SAMPLE_UBEREATS_INVOICE
 
 
+@pytest.fixture(autouse=True)
+def _reset_circuit_state():
+    """Keep provider circuit state isolated between tests."""
+    reset_circuit_state()
+    yield
+    reset_circuit_state()
+
+
 class TestExtractInvoice:
     """Tests for extract_invoice function."""
 
@@ -89,6 +100,65 @@ class TestExtractInvoice:
         assert result.latency_ms > 0
 
 
+class TestProviderCircuit:
+    """Tests for circuit-breaker provider routing."""
+
+    def test_circuit_closed_below_failure_threshold(self):
+        """Circuit stays closed until consecutive failures hit threshold."""
+        _record_provider_result("gemini", success=False)
+        _record_provider_result("gemini", success=False)
+
+        assert not _is_circuit_open("gemini")
+
+    def test_circuit_opens_after_consecutive_failures(self):
+        """Circuit opens once the failure threshold is reached."""
+        for _ in range(3):
+            _record_provider_result("gemini", success=False)
+
+        assert _is_circuit_open("gemini")
+
+    def test_success_closes_circuit(self):
+        """A successful call resets the failure count and closes the circuit."""
+        for _ in range(3):
+            _record_provider_result("gemini", success=False)
+        _record_provider_result("gemini", success=True)
+
+        assert not _is_circuit_open("gemini")
+
+    def test_open_circuit_routes_to_fallback_first(
+        self, mock_llm_adapter_failure, mock_llm_adapter, sample_png_data
+    ):
+        """When primary circuit is open, fallback is tried first and primary skipped."""
+        for _ in range(3):
+            _record_provider_result("gemini", success=False)
+
+        result = extract_invoice(
+            images_data=[sample_png_data],
+            vendor_type=VendorType.UBEREATS,
+            llm_adapter=mock_llm_adapter_failure,
+            fallback_adapter=mock_llm_adapter,
+        )
+
+        assert result.success
+        assert result.provider == "openrouter"
+        mock_llm_adapter_failure.extract.assert_not_called()
+
+    def test_closed_circuit_keeps_primary_first(
+        self, mock_llm_adapter, mock_llm_adapter_failure, sample_png_data
+    ):
+        """With a closed circuit the primary adapter is still tried first."""
+        result = extract_invoice(
+            images_data=[sample_png_data],
+            vendor_type=VendorType.UBEREATS,
+            llm_adapter=mock_llm_adapter,
+            fallback_adapter=mock_llm_adapter_failure,
+        )
+
+        assert result.success
+        assert result.provider == "gemini"
+        mock_llm_adapter_failure.extract.assert_not_called()
+
+
 class TestLoadPromptTemplate:
     """Tests for load_prompt_template function."""
 